@@ -17,6 +17,7 @@ from bpy.types import PropertyGroup, Panel, Operator
 from bpy_extras import anim_utils
 from mathutils import Vector, Euler
 import math
+import numpy as np
 
 bl_info = {
     "name": "Auto7Seg",
@@ -35,20 +36,92 @@ bl_info = {
 #  GGG
 # E   C
 #  DDD
-DIGIT_PATTERNS = {
-    0: [True, True, True, True, True, True, False],      # A,B,C,D,E,F on; G off
-    1: [False, True, True, False, False, False, False],  # B,C on
-    2: [True, True, False, True, True, False, True],     # A,B,D,E,G on
-    3: [True, True, True, True, False, False, True],     # A,B,C,D,G on
-    4: [False, True, True, False, False, True, True],    # B,C,F,G on
-    5: [True, False, True, True, False, True, True],     # A,C,D,F,G on
-    6: [True, False, True, True, True, True, True],      # A,C,D,E,F,G on
-    7: [True, True, True, False, False, False, False],   # A,B,C on
-    8: [True, True, True, True, True, True, True],       # All on
-    9: [True, True, True, True, False, True, True],      # A,B,C,D,F,G on
+# Each digit is a 7-bit mask where bit i is set when segment SEGMENT_NAMES[i] is on
+# (bit 0 = A ... bit 6 = G), so XOR-ing two digits yields the segments that change.
+PATTERN_BITS = (
+    0b0111111,  # 0: A,B,C,D,E,F on; G off
+    0b0000110,  # 1: B,C on
+    0b1011011,  # 2: A,B,D,E,G on
+    0b1001111,  # 3: A,B,C,D,G on
+    0b1100110,  # 4: B,C,F,G on
+    0b1101101,  # 5: A,C,D,F,G on
+    0b1111101,  # 6: A,C,D,E,F,G on
+    0b0000111,  # 7: A,B,C on
+    0b1111111,  # 8: All on
+    0b1101111,  # 9: A,B,C,D,F,G on
+)
+
+# Set to True to print detailed progress while generating animations
+_DEBUG = False
+
+# Default "on" flip angle for the rotation modes
+_PI = math.radians(180)
+
+SEGMENT_NAMES = ('A', 'B', 'C', 'D', 'E', 'F', 'G')
+SEGMENT_MASKS = tuple(1 << i for i in range(7))
+
+# (10, 7) on/off state of every segment for every digit, decoded once from PATTERN_BITS
+DIGIT_SEGMENT_STATES = (np.array(PATTERN_BITS)[:, None] & np.array(SEGMENT_MASKS)) != 0
+
+# On/off property names, keyed data path and panel label of each transform mode
+_MODE_PROPS = {
+    'LOCAL_ROTATION': ('on_local_rotation', 'off_local_rotation', 'rotation_euler', "Rotation"),
+    'GLOBAL_ROTATION': ('on_global_rotation', 'off_global_rotation', 'rotation_euler', "Rotation"),
+    'LOCAL_LOCATION': ('on_local_location', 'off_local_location', 'location', "Location"),
+    'GLOBAL_LOCATION': ('on_global_location', 'off_global_location', 'location', "Location"),
+    'SCALE': ('on_scale', 'off_scale', 'scale', "Scale"),
+}
+
+# Reads the active object's transform for each "Set to Active" target property
+_PROP_SOURCE = {
+    'on_local_rotation': lambda obj: obj.rotation_euler,
+    'off_local_rotation': lambda obj: obj.rotation_euler,
+    'on_global_rotation': lambda obj: obj.matrix_world.to_euler('XYZ'),
+    'off_global_rotation': lambda obj: obj.matrix_world.to_euler('XYZ'),
+    'on_local_location': lambda obj: obj.location,
+    'off_local_location': lambda obj: obj.location,
+    'on_global_location': lambda obj: obj.matrix_world.translation,
+    'off_global_location': lambda obj: obj.matrix_world.translation,
+    'on_scale': lambda obj: obj.scale,
+    'off_scale': lambda obj: obj.scale,
 }
 
-SEGMENT_NAMES = ['A', 'B', 'C', 'D', 'E', 'F', 'G']
+
+def _plan_keyframes(changes, transition_starts, transition_ends, hold_end_keyframe, cyclic):
+    """Return the keyframe frames of one segment and the planned digit each keyframe holds"""
+    # The first digit is held from the start frame to the end of its hold. After that
+    # only transitions that change this segment get a start and an end keyframe;
+    # the first transition's start is the end of that hold.
+    key_frames = np.empty(2 + 2 * len(changes), dtype=np.int32)
+    key_frames[0] = transition_ends[0]
+    key_frames[1] = hold_end_keyframe
+    key_frames[2::2] = transition_starts[changes]
+    key_frames[3::2] = transition_ends[changes]
+    
+    key_rows = np.empty(len(key_frames), dtype=np.intp)
+    key_rows[:2] = 0
+    key_rows[2::2] = changes - 1
+    key_rows[3::2] = changes
+    
+    if len(changes) and changes[0] == 1:
+        key_frames = np.delete(key_frames, 2)
+        key_rows = np.delete(key_rows, 2)
+    
+    # Every curve must end on the final transition so they all share one cycle length
+    last = len(transition_ends) - 1
+    if cyclic and (not len(changes) or changes[-1] != last):
+        key_frames = np.append(key_frames, transition_ends[last])
+        key_rows = np.append(key_rows, last)
+    
+    # Without a hold (speed == switching speed) each hold end lands on the frame where the
+    # next transition starts, holding the same digit, so those duplicate keys are dropped
+    if hold_end_keyframe == transition_ends[0]:
+        keep = np.ones(len(key_frames), dtype=bool)
+        keep[1:] = (key_frames[1:] != key_frames[:-1]) | (key_rows[1:] != key_rows[:-1])
+        key_frames = key_frames[keep]
+        key_rows = key_rows[keep]
+    
+    return key_frames, key_rows
 
 
 class Auto7SegProperties(PropertyGroup):
@@ -109,13 +182,13 @@ class Auto7SegProperties(PropertyGroup):
     on_local_rotation: FloatVectorProperty(
         name="On Local Rotation",
         subtype='EULER',
-        default=(math.radians(180), 0.0, 0.0),
+        default=(_PI, 0.0, 0.0),
         description="Local rotation when segment is ON"
     )
     on_global_rotation: FloatVectorProperty(
         name="On Global Rotation",
         subtype='EULER',
-        default=(math.radians(180), 0.0, 0.0),
+        default=(_PI, 0.0, 0.0),
         description="Global rotation when segment is ON"
     )
     on_local_location: FloatVectorProperty(
@@ -230,19 +303,19 @@ class Auto7SegProperties(PropertyGroup):
     
     def all_segments_assigned(self):
         """Check if all 7 segments have been assigned"""
-        return all([
-            self.segment_a,
-            self.segment_b,
-            self.segment_c,
-            self.segment_d,
-            self.segment_e,
-            self.segment_f,
-            self.segment_g,
-        ])
+        return bool(
+            self.segment_a
+            and self.segment_b
+            and self.segment_c
+            and self.segment_d
+            and self.segment_e
+            and self.segment_f
+            and self.segment_g
+        )
     
     def get_segments(self):
-        """Return list of segment objects in order A-G"""
-        return [
+        """Return tuple of segment objects in order A-G"""
+        return (
             self.segment_a,
             self.segment_b,
             self.segment_c,
@@ -250,7 +323,7 @@ class Auto7SegProperties(PropertyGroup):
             self.segment_e,
             self.segment_f,
             self.segment_g,
-        ]
+        )
 
 
 class AUTO7SEG_OT_set_to_active(Operator):
@@ -260,7 +333,31 @@ class AUTO7SEG_OT_set_to_active(Operator):
     bl_options = {'REGISTER', 'UNDO'}
     
     property_name: bpy.props.StringProperty(name="Property Name")
-    axis: IntProperty(name="Axis Index", default=0)
+    axis_mask: IntProperty(
+        name="Axis Mask",
+        default=0b111,
+        min=0,
+        max=0b111,
+        description="Axes to copy from the active object (bit 0 = X, bit 1 = Y, bit 2 = Z)",
+        options={'SKIP_SAVE'}
+    )
+    
+    def invoke(self, context, event):
+        # The panel's single eyedropper leaves the mask unset, so ask which axes to copy.
+        # Copying X only keeps the LOCAL_ROTATION Y/Z preserve rule intact.
+        if self.properties.is_property_set("axis_mask"):
+            return self.execute(context)
+        
+        property_name = self.property_name
+        
+        def draw_menu(menu, context):
+            for text, mask in (("All Axes", 0b111), ("X", 0b001), ("Y", 0b010), ("Z", 0b100)):
+                op = menu.layout.operator(AUTO7SEG_OT_set_to_active.bl_idname, text=text)
+                op.property_name = property_name
+                op.axis_mask = mask
+        
+        context.window_manager.popup_menu(draw_menu, title="Set to Active")
+        return {'CANCELLED'}
     
     def execute(self, context):
         props = context.scene.auto7seg
@@ -271,37 +368,18 @@ class AUTO7SEG_OT_set_to_active(Operator):
             return {'CANCELLED'}
         
         # Get the value from active object based on property name
-        value = None
-        
-        if self.property_name == 'on_local_rotation':
-            value = active.rotation_euler[self.axis]
-        elif self.property_name == 'off_local_rotation':
-            value = active.rotation_euler[self.axis]
-        elif self.property_name == 'on_global_rotation':
-            value = active.matrix_world.to_euler('XYZ')[self.axis]
-        elif self.property_name == 'off_global_rotation':
-            value = active.matrix_world.to_euler('XYZ')[self.axis]
-        elif self.property_name == 'on_local_location':
-            value = active.location[self.axis]
-        elif self.property_name == 'off_local_location':
-            value = active.location[self.axis]
-        elif self.property_name == 'on_global_location':
-            value = active.matrix_world.translation[self.axis]
-        elif self.property_name == 'off_global_location':
-            value = active.matrix_world.translation[self.axis]
-        elif self.property_name == 'on_scale':
-            value = active.scale[self.axis]
-        elif self.property_name == 'off_scale':
-            value = active.scale[self.axis]
-        
-        if value is not None:
-            # Get current vector and update the specific axis
-            current = list(getattr(props, self.property_name))
-            current[self.axis] = value
-            setattr(props, self.property_name, current)
-            return {'FINISHED'}
+        getter = _PROP_SOURCE.get(self.property_name)
+        if getter is None:
+            return {'CANCELLED'}
         
-        return {'CANCELLED'}
+        # Get current vector and update the masked axes from a single read of the source
+        source = getter(active)
+        current = list(getattr(props, self.property_name))
+        for axis in range(3):
+            if self.axis_mask & (1 << axis):
+                current[axis] = source[axis]
+        setattr(props, self.property_name, current)
+        return {'FINISHED'}
 
 
 class AUTO7SEG_OT_generate_animation(Operator):
@@ -327,6 +405,7 @@ class AUTO7SEG_OT_generate_animation(Operator):
         else:
             speed_frames = int(props.speed)
             switch_frames = int(props.switching_speed)
+        hold_frames = speed_frames - switch_frames
         
         # Determine digit sequence
         if props.count_mode == 'COUNT_UP':
@@ -342,390 +421,157 @@ class AUTO7SEG_OT_generate_animation(Operator):
                 digits = list(range(start, end - 1, -1))
         
         segments = props.get_segments()
-        print(f"Auto7Seg: Processing {len(digits)} digits for segments: {[s.name if s else 'None' for s in segments]}")
+        if _DEBUG:
+            print(f"Auto7Seg: Processing {len(digits)} digits for segments: {[s.name if s else 'None' for s in segments]}")
         
-        # Get on/off values based on transform mode
+        # Get on/off values based on transform mode, as float32 arrays so they broadcast
+        # straight into the per-segment target matrices below
         mode = props.transform_mode
-        if mode == 'LOCAL_ROTATION':
-            # Store as tuples for easier handling
-            on_values_tuple = tuple(props.on_local_rotation)
-            off_values_tuple = tuple(props.off_local_rotation)
-            data_path = 'rotation_euler'
-        elif mode == 'GLOBAL_ROTATION':
-            on_values_tuple = tuple(props.on_global_rotation)
-            off_values_tuple = tuple(props.off_global_rotation)
-            data_path = 'rotation_euler'
-        elif mode == 'LOCAL_LOCATION':
-            on_values = Vector(props.on_local_location)
-            off_values = Vector(props.off_local_location)
-            data_path = 'location'
-        elif mode == 'GLOBAL_LOCATION':
-            on_values = Vector(props.on_global_location)
-            off_values = Vector(props.off_global_location)
-            data_path = 'location'
-        else:  # SCALE
-            on_values = Vector(props.on_scale)
-            off_values = Vector(props.off_scale)
-            data_path = 'scale'
-        
-        current_frame = scene.frame_start
-        
-        
-        # Helper function to apply rotation to a segment
-        def apply_rotation(segment, target_tuple, mode):
-            try:
-                # Ensure we're in object mode and using XYZ Euler rotation mode
-                if segment.rotation_mode != 'XYZ':
-                    segment.rotation_mode = 'XYZ'
-                
-                target_x = target_tuple[0]
-                target_y = target_tuple[1]
-                target_z = target_tuple[2]
-                
-                if mode == 'LOCAL_ROTATION':
-                    # Modify all 3 axes - but intelligently.
-                    # For the main use case (7-segment), we usually only animate X.
-                    # The user might have base rotations on Y or Z (e.g. -90) that must be preserved.
-                    # If the Target Y/Z are 0 (default), we assume we should preserve the object's current Y/Z.
-                    
-                    current_rot = segment.rotation_euler
-                    
-                    # Use target X (absolute)
-                    new_x = target_x
-                    
-                    # Use target Y if it's non-zero, otherwise preserve current Y
-                    # (This is a heuristic to support the common case of "only animate X" while allowing custom Y/Z if specified)
-                    # Note: A safer approach is strictly: X comes from UI, Y/Z preserved.
-                    # Given the user's specific setup with -90 Y segments, preserving is key.
-                    
-                    # Let's strictly preserve Y and Z for LOCAL_ROTATION if target is 0? 
-                    # Or better: Just preserve Y and Z always, assuming the UI controls the "Active" axis (X).
-                    # But the UI shows X, Y, Z inputs.
-                    
-                    # Compromise: If the UI inputs for Y and Z are 0 (Off) and 0 (On), we preserve.
-                    # If they are used (non-zero), we use them.
-                    
-                    use_y = target_y
-                    if props.on_local_rotation[1] == 0 and props.off_local_rotation[1] == 0:
-                         use_y = current_rot.y
-                         
-                    use_z = target_z
-                    if props.on_local_rotation[2] == 0 and props.off_local_rotation[2] == 0:
-                         use_z = current_rot.z
-                    
-                    segment.rotation_euler = Euler((new_x, use_y, use_z), 'XYZ')
-                    
-                else:  # GLOBAL_ROTATION
-                    # ... (Global logic)
-                    target_world = Euler(target_tuple, 'XYZ')
-                    if segment.parent:
-                        parent_inv = segment.parent.matrix_world.inverted()
-                        target_matrix = target_world.to_matrix().to_4x4()
-                        local_matrix = parent_inv @ target_matrix
-                        segment.rotation_euler = local_matrix.to_euler('XYZ')
-                    else:
-                        segment.rotation_euler = target_world
-            except Exception as e:
-                print(f"Auto7Seg Error applying rotation to {segment.name}: {e}")
-        
-        # Helper function to apply location/scale to a segment
-        def apply_transform(segment, final_values, mode):
-            if mode in ('LOCAL_LOCATION', 'GLOBAL_LOCATION'):
-                segment.location = final_values
-            else:  # SCALE
-                segment.scale = final_values
-        
-        # Helper function to get channelbag for Blender 5.0 API
-        def get_channelbag(obj):
-            """Get the ActionChannelbag for an object's action (Blender 5.0 API)"""
-            if not obj.animation_data or not obj.animation_data.action:
-                return None
-            
-            action = obj.animation_data.action
-            action_slot = obj.animation_data.action_slot
-            
-            if action_slot is None:
-                return None
-            
-            try:
-                channelbag = anim_utils.action_get_channelbag_for_slot(action, action_slot)
-                return channelbag
-            except Exception:
-                return None
-        
-        # Helper function for keyframing using Blender's standard API
-        def insert_keyframe(obj, data_path, frame):
-            """Insert keyframe using Blender's standard API (handles linked duplicates properly)"""
-            if obj is None:
-                print(f"Auto7Seg DEBUG: insert_keyframe called with None object!")
-                return
-            
-            print(f"Auto7Seg DEBUG: insert_keyframe called for {obj.name}, data_path={data_path}, frame={frame}")
-            
-            # Ensure animation data exists (should already be set up, but check anyway)
-            if not obj.animation_data:
-                print(f"Auto7Seg DEBUG: Creating animation_data for {obj.name}")
-                obj.animation_data_create()
-            
-            # Safety check: ensure action is unique (should already be done upfront, but double-check)
-            if obj.animation_data.action:
-                action_name = obj.animation_data.action.name
-                users = obj.animation_data.action.users
-                print(f"Auto7Seg DEBUG: {obj.name} has action '{action_name}' with {users} users")
-                if users > 1:
-                    print(f"Auto7Seg DEBUG: Action '{action_name}' is shared! Creating copy for {obj.name}")
-                    obj.animation_data.action = obj.animation_data.action.copy()
-                    print(f"Auto7Seg DEBUG: New action '{obj.animation_data.action.name}' created for {obj.name}")
-            else:
-                print(f"Auto7Seg DEBUG: {obj.name} has no action! This should not happen.")
-            
-            # Get current value before keyframing
-            if data_path == 'rotation_euler':
-                current_value = tuple(obj.rotation_euler)
-            elif data_path == 'location':
-                current_value = tuple(obj.location)
-            elif data_path == 'scale':
-                current_value = tuple(obj.scale)
-            else:
-                current_value = "unknown"
-            
-            print(f"Auto7Seg DEBUG: {obj.name} current {data_path} value: {current_value}")
-            
-            # Use Blender's standard keyframe_insert which handles everything properly
-            # The frame parameter allows inserting at any frame without changing the current frame
-            try:
-                obj.keyframe_insert(data_path=data_path, frame=int(frame))
-                print(f"Auto7Seg DEBUG: Successfully called keyframe_insert for {obj.name} at frame {frame}")
-                
-                # Verify keyframe was actually created (optional check, don't fail if this errors)
-                try:
-                    if obj.animation_data and obj.animation_data.action:
-                        # Try to access fcurves - may not be available immediately or API may differ
-                        if hasattr(obj.animation_data.action, 'fcurves'):
-                            fcurves = obj.animation_data.action.fcurves
-                            matching_fcurves = [fc for fc in fcurves if fc.data_path == data_path]
-                            print(f"Auto7Seg DEBUG: {obj.name} has {len(matching_fcurves)} fcurves matching {data_path}")
-                            for fc in matching_fcurves:
-                                keyframe_count = len(fc.keyframe_points)
-                                print(f"Auto7Seg DEBUG:   FCurve[{fc.array_index}] has {keyframe_count} keyframes")
-                                if keyframe_count > 0:
-                                    last_kf = fc.keyframe_points[-1]
-                                    print(f"Auto7Seg DEBUG:     Last keyframe at frame {last_kf.co[0]}, value {last_kf.co[1]}")
-                        else:
-                            print(f"Auto7Seg DEBUG: Action '{obj.animation_data.action.name}' exists but fcurves not accessible (may be normal)")
-                    else:
-                        print(f"Auto7Seg DEBUG: WARNING - {obj.name} has no animation_data or action after keyframe_insert!")
-                except Exception as verify_error:
-                    # Don't fail on verification errors - keyframe_insert succeeded
-                    print(f"Auto7Seg DEBUG: Could not verify keyframe (non-critical): {verify_error}")
-            except Exception as e:
-                print(f"Auto7Seg DEBUG: ERROR inserting keyframe for {obj.name}: {e}")
-                import traceback
-                traceback.print_exc()
-                raise
+        on_prop, off_prop, data_path, _ = _MODE_PROPS[mode]
+        
+        on_values = np.array(getattr(props, on_prop), dtype=np.float32)
+        off_values = np.array(getattr(props, off_prop), dtype=np.float32)
         
         # Ensure each segment has its own unique action before we start keyframing
         # This is critical for linked duplicates which may share actions
-        print(f"Auto7Seg DEBUG: Initializing actions for {len(segments)} segments")
+        if _DEBUG:
+            print(f"Auto7Seg DEBUG: Initializing actions for {len(segments)} segments")
         for seg_idx, segment in enumerate(segments):
             if segment is None:
-                print(f"Auto7Seg DEBUG: Segment {seg_idx} is None, skipping")
+                if _DEBUG:
+                    print(f"Auto7Seg DEBUG: Segment {seg_idx} is None, skipping")
                 continue
             
-            print(f"Auto7Seg DEBUG: Processing segment {seg_idx}: {segment.name}")
-            print(f"Auto7Seg DEBUG:   Type: {type(segment)}")
-            print(f"Auto7Seg DEBUG:   Data: {segment.data.name if segment.data else 'None'}")
+            if _DEBUG:
+                print(f"Auto7Seg DEBUG: Processing segment {seg_idx}: {segment.name}")
+                print(f"Auto7Seg DEBUG:   Type: {type(segment)}")
+                print(f"Auto7Seg DEBUG:   Data: {segment.data.name if segment.data else 'None'}")
             
-            if not segment.animation_data:
-                print(f"Auto7Seg DEBUG:   Creating animation_data for {segment.name}")
-                segment.animation_data_create()
-            else:
+            animation_data = segment.animation_data
+            if not animation_data:
+                if _DEBUG:
+                    print(f"Auto7Seg DEBUG:   Creating animation_data for {segment.name}")
+                animation_data = segment.animation_data_create()
+            elif _DEBUG:
                 print(f"Auto7Seg DEBUG:   {segment.name} already has animation_data")
             
-            if segment.animation_data.action:
-                action_name = segment.animation_data.action.name
-                users = segment.animation_data.action.users
-                print(f"Auto7Seg DEBUG:   {segment.name} has action '{action_name}' with {users} users")
+            action = animation_data.action
+            if action:
+                users = action.users
+                if _DEBUG:
+                    print(f"Auto7Seg DEBUG:   {segment.name} has action '{action.name}' with {users} users")
                 # If action is shared, create a unique copy
                 if users > 1:
-                    old_action = segment.animation_data.action
-                    segment.animation_data.action = old_action.copy()
-                    print(f"Auto7Seg DEBUG:   Created unique action '{segment.animation_data.action.name}' for {segment.name} (was shared)")
-                else:
-                    print(f"Auto7Seg DEBUG:   {segment.name} action '{action_name}' is already unique")
+                    action = animation_data.action = action.copy()
+                    if _DEBUG:
+                        print(f"Auto7Seg DEBUG:   Created unique action '{action.name}' for {segment.name} (was shared)")
+                elif _DEBUG:
+                    print(f"Auto7Seg DEBUG:   {segment.name} action '{action.name}' is already unique")
             else:
                 # Create new action if none exists
-                new_action = bpy.data.actions.new(name=f"Auto7Seg_{segment.name}")
-                segment.animation_data.action = new_action
-                print(f"Auto7Seg DEBUG:   Created new action '{new_action.name}' for {segment.name}")
+                action = animation_data.action = bpy.data.actions.new(name=f"Auto7Seg_{segment.name}")
+                if _DEBUG:
+                    print(f"Auto7Seg DEBUG:   Created new action '{action.name}' for {segment.name}")
             
-            # Final verification
-            if segment.animation_data.action:
-                final_users = segment.animation_data.action.users
-                print(f"Auto7Seg DEBUG:   Final state: {segment.name} has action '{segment.animation_data.action.name}' with {final_users} users")
-            else:
-                print(f"Auto7Seg DEBUG:   ERROR: {segment.name} has no action after initialization!")
-        
-        # First, set all segments to their initial state (first digit) without keyframing
-        # Keyframes will be added at the transition start instead
-        first_digit = digits[0]
-        first_pattern = DIGIT_PATTERNS[first_digit]
-        
-        print(f"Auto7Seg: Initializing state for digit {first_digit} (no keyframe yet)")
-        
-        for seg_idx, (segment, is_on) in enumerate(zip(segments, first_pattern)):
-            if segment is None:
-                print(f"Auto7Seg: Segment {seg_idx} is None, skipping")
-                continue
+            # Keyframes are written straight into the slot's channelbag, so the object needs a slot
+            if animation_data.action_slot is None:
+                animation_data.action_slot = action.slots.new(id_type='OBJECT', name=segment.name)
             
-            print(f"Auto7Seg: Processing segment {segment.name} (Idx: {seg_idx}), State: {'ON' if is_on else 'OFF'}")
+            if _DEBUG:
+                print(f"Auto7Seg DEBUG:   Final state: {segment.name} has action '{action.name}' with {action.users} users")
+        
+        # The global modes target a world-space value, which only depends on the segment's
+        # parent. Segments usually share one parent (a digit empty), so the parent-space on/off
+        # targets are resolved once per unique parent and then shared by its segments.
+        global_on_targets = {}
+        global_off_targets = {}
+        if mode in ('GLOBAL_ROTATION', 'GLOBAL_LOCATION'):
+            segment_parents = [segment.parent if segment else None for segment in segments]
+            if mode == 'GLOBAL_ROTATION':
+                on_world = Euler(on_values, 'XYZ').to_matrix().to_4x4()
+                off_world = Euler(off_values, 'XYZ').to_matrix().to_4x4()
             
-            try:
-                print(f"Auto7Seg DEBUG: Setting initial state for {segment.name}")
+            targets_by_parent = {}
+            for parent in set(segment_parents):
+                # Without a parent the world-space values already are the local targets
+                if parent is None:
+                    targets_by_parent[parent] = (on_values, off_values)
+                    continue
                 
-                if mode in ('LOCAL_ROTATION', 'GLOBAL_ROTATION'):
-                    target_tuple = on_values_tuple if is_on else off_values_tuple
-                    print(f"Auto7Seg DEBUG:   Applying rotation {target_tuple} to {segment.name}")
-                    apply_rotation(segment, target_tuple, mode)
+                parent_inv = parent.matrix_world.inverted()
+                if mode == 'GLOBAL_ROTATION':
+                    targets_by_parent[parent] = (
+                        (parent_inv @ on_world).to_euler('XYZ'),
+                        (parent_inv @ off_world).to_euler('XYZ'),
+                    )
                 else:
-                    target_values = on_values if is_on else off_values
-                    print(f"Auto7Seg DEBUG:   Applying {mode} {target_values} to {segment.name}")
-                    if mode == 'GLOBAL_LOCATION':
-                        if segment.parent:
-                            parent_inv = segment.parent.matrix_world.inverted()
-                            local_pos = parent_inv @ target_values
-                        else:
-                            local_pos = target_values
-                        segment.location = local_pos
-                    else:
-                        apply_transform(segment, target_values, mode)
-            except Exception as e:
-                print(f"Auto7Seg ERROR processing segment {segment.name}: {e}")
-                import traceback
-                traceback.print_exc()
-        
-        # Now animate through all digits
-        for digit_idx, digit in enumerate(digits):
-            pattern = DIGIT_PATTERNS[digit]
+                    targets_by_parent[parent] = (parent_inv @ Vector(on_values), parent_inv @ Vector(off_values))
             
-            # For first digit, add two keyframes at the start with correct gap
-            if digit_idx == 0:
-                # Add two keyframes: one at current_frame, one at current_frame + (speed_frames - switch_frames)
-                # The hold duration is speed_frames - switch_frames, then transition takes switch_frames
-                first_keyframe = current_frame
-                hold_end_keyframe = current_frame + (speed_frames - switch_frames)
-                
-                print(f"Auto7Seg DEBUG: Adding two keyframes for first digit {digit} at frames {first_keyframe} and {hold_end_keyframe} (hold duration: {speed_frames - switch_frames})")
-                
-                for seg_idx, (segment, is_on) in enumerate(zip(segments, first_pattern)):
+            for segment, parent in zip(segments, segment_parents):
+                if segment is not None:
+                    global_on_targets[segment], global_off_targets[segment] = targets_by_parent[parent]
+        
+        # The rotation modes key Euler XYZ channels
+        if mode in ('LOCAL_ROTATION', 'GLOBAL_ROTATION'):
+            for segment in segments:
+                if segment is not None and segment.rotation_mode != 'XYZ':
+                    segment.rotation_mode = 'XYZ'
+        
+        # Resolve the local-space on/off values of every segment, one row per segment. The
+        # local modes share the UI values, so they are broadcast to all rows at once.
+        if mode in ('GLOBAL_ROTATION', 'GLOBAL_LOCATION'):
+            on_matrix = np.zeros((len(segments), 3), dtype=np.float32)
+            off_matrix = np.zeros((len(segments), 3), dtype=np.float32)
+            for seg_idx, segment in enumerate(segments):
+                if segment is not None:
+                    on_matrix[seg_idx] = global_on_targets[segment]
+                    off_matrix[seg_idx] = global_off_targets[segment]
+        else:
+            on_matrix = np.tile(on_values, (len(segments), 1))
+            off_matrix = np.tile(off_values, (len(segments), 1))
+        
+        # For LOCAL_ROTATION the main use case (7-segment) usually only animates X, while the
+        # segments may have base rotations on Y or Z (e.g. -90) that must be preserved. So if the
+        # UI inputs for Y or Z are 0 for both On and Off, that axis keeps the segment's own value;
+        # if they are used (non-zero), we use them.
+        if mode == 'LOCAL_ROTATION':
+            preserve_y = on_values[1] == 0 and off_values[1] == 0
+            preserve_z = on_values[2] == 0 and off_values[2] == 0
+            if preserve_y or preserve_z:
+                for seg_idx, segment in enumerate(segments):
                     if segment is None:
                         continue
                     
-                    # First keyframe: current state (first digit)
-                    if mode in ('LOCAL_ROTATION', 'GLOBAL_ROTATION'):
-                        insert_keyframe(segment, 'rotation_euler', first_keyframe)
-                    else:
-                        insert_keyframe(segment, data_path, first_keyframe)
-                    
-                    # Second keyframe: same state (end of hold, start of transition)
-                    if mode in ('LOCAL_ROTATION', 'GLOBAL_ROTATION'):
-                        insert_keyframe(segment, 'rotation_euler', hold_end_keyframe)
-                    else:
-                        insert_keyframe(segment, data_path, hold_end_keyframe)
-                
-                # Move to transition start timing
-                current_frame = hold_end_keyframe
+                    base_rotation = segment.rotation_euler
+                    if preserve_y:
+                        on_matrix[seg_idx, 1] = off_matrix[seg_idx, 1] = base_rotation.y
+                    if preserve_z:
+                        on_matrix[seg_idx, 2] = off_matrix[seg_idx, 2] = base_rotation.z
+        
+        # Only axes whose on and off values differ are animated. The others never move, so
+        # they get no fcurve at all (nothing to store or evaluate on playback); their constant
+        # value is set on the object below. In the usual setup only one axis flips.
+        axis_animated = np.abs(on_matrix - off_matrix) > 1e-6
+        
+        # Create the animated axis fcurves for each segment up front. Curves left over from a
+        # previous run are removed so the animation is rebuilt from scratch.
+        fcurves = {}
+        animated_axes = {}
+        for seg_idx, segment in enumerate(segments):
+            if segment is None:
                 continue
             
-            # Keyframe the previous state at start of transition (current position)
-            # Skip adding keyframe at transition_start if it's the same frame as the previous digit's end
-            transition_start = current_frame
-            transition_end = current_frame + switch_frames
+            axes = tuple(int(i) for i in np.flatnonzero(axis_animated[seg_idx]))
+            animated_axes[segment] = axes
             
-            # For digit 1, we need special handling since transition_start overlaps with digit 0's hold end
-            if digit_idx == 1:
-                # transition_start is already keyframed by digit 0's second keyframe (end of hold)
-                # transition_end is the end of transition (start of digit 1's hold)
-                # Only add keyframes for segments that change state
-                print(f"Auto7Seg DEBUG: Processing digit {digit} transition from frame {transition_start} to {transition_end}")
-                
-                for seg_idx, (segment, is_on) in enumerate(zip(segments, pattern)):
-                    if segment is None:
-                        continue
-                    
-                    # Check if this segment changes state from digit 0 to digit 1
-                    first_is_on = first_pattern[seg_idx]
-                    state_changes = (first_is_on != is_on)
-                    
-                    if state_changes:
-                        # Add keyframe at transition end for segments that change state
-                        if mode in ('LOCAL_ROTATION', 'GLOBAL_ROTATION'):
-                            target_tuple = on_values_tuple if is_on else off_values_tuple
-                            apply_rotation(segment, target_tuple, mode)
-                            insert_keyframe(segment, 'rotation_euler', transition_end)
-                        else:
-                            target_values = on_values if is_on else off_values
-                            if mode == 'GLOBAL_LOCATION':
-                                if segment.parent:
-                                    parent_inv = segment.parent.matrix_world.inverted()
-                                    local_pos = parent_inv @ target_values
-                                else:
-                                    local_pos = target_values
-                                segment.location = local_pos
-                            else:
-                                apply_transform(segment, target_values, mode)
-                            
-                            insert_keyframe(segment, data_path, transition_end)
-                    else:
-                        # For segments that don't change, add keyframe at transition_end to maintain timing
-                        # This ensures the hold continues correctly
-                        if mode in ('LOCAL_ROTATION', 'GLOBAL_ROTATION'):
-                            insert_keyframe(segment, 'rotation_euler', transition_end)
-                        else:
-                            insert_keyframe(segment, data_path, transition_end)
-                
-                # Move to next digit timing - transition_end + hold duration
-                current_frame = transition_end + (speed_frames - switch_frames)
-            else:
-                # Normal processing for other digits
-                print(f"Auto7Seg DEBUG: Processing digit {digit} at frames {transition_start}-{transition_end}")
-                for seg_idx, (segment, is_on) in enumerate(zip(segments, pattern)):
-                    if segment is None:
-                        print(f"Auto7Seg DEBUG: Segment {seg_idx} is None, skipping")
-                        continue
-                    
-                    print(f"Auto7Seg DEBUG: Processing segment {segment.name} for digit {digit}, state={'ON' if is_on else 'OFF'}")
-                    
-                    # Keyframe current state at transition start
-                    print(f"Auto7Seg DEBUG: Keyframing {segment.name} at transition_start frame {transition_start}")
-                    if mode in ('LOCAL_ROTATION', 'GLOBAL_ROTATION'):
-                        insert_keyframe(segment, 'rotation_euler', transition_start)
-                    else:
-                        insert_keyframe(segment, data_path, transition_start)
-                    
-                    # Set target state and keyframe at transition end
-                    if mode in ('LOCAL_ROTATION', 'GLOBAL_ROTATION'):
-                        target_tuple = on_values_tuple if is_on else off_values_tuple
-                        print(f"Auto7Seg DEBUG: Setting {segment.name} to rotation {target_tuple}")
-                        apply_rotation(segment, target_tuple, mode)
-                        insert_keyframe(segment, 'rotation_euler', transition_end)
-                    else:
-                        target_values = on_values if is_on else off_values
-                        print(f"Auto7Seg DEBUG: Setting {segment.name} to {mode} {target_values}")
-                        if mode == 'GLOBAL_LOCATION':
-                            if segment.parent:
-                                parent_inv = segment.parent.matrix_world.inverted()
-                                local_pos = parent_inv @ target_values
-                            else:
-                                local_pos = target_values
-                            segment.location = local_pos
-                        else:
-                            apply_transform(segment, target_values, mode)
-                        
-                        insert_keyframe(segment, data_path, transition_end)
-                
-                # Move to next digit timing
-                current_frame += speed_frames
+            animation_data = segment.animation_data
+            channelbag = anim_utils.action_ensure_channelbag_for_slot(animation_data.action, animation_data.action_slot)
+            for array_index in (0, 1, 2):
+                old_fcurve = channelbag.fcurves.find(data_path, index=array_index)
+                if old_fcurve is not None:
+                    channelbag.fcurves.remove(old_fcurve)
+            for array_index in axes:
+                fcurves[segment, array_index] = channelbag.fcurves.new(data_path, index=array_index)
         
         # Determine if cyclic should be applied
         # For COUNT_UP and COUNT_DOWN, always add cyclic
@@ -736,137 +582,81 @@ class AUTO7SEG_OT_generate_animation(Operator):
         elif props.count_mode == 'COUNT_FROM_TO' and props.cyclic:
             should_add_cyclic = True
         
-        # If cyclic, add transition from last digit back to first digit
-        if should_add_cyclic and len(digits) > 0:
-            print(f"Auto7Seg DEBUG: Adding transition from last digit back to first for cyclic animation")
-            
-            # Get the first and last digit patterns for looping
-            first_digit = digits[0]
-            first_pattern = DIGIT_PATTERNS[first_digit]
-            last_digit = digits[-1]
-            last_pattern = DIGIT_PATTERNS[last_digit]
+        # Build the whole timeline at once. Digit k (k >= 1) switches in over
+        # [k * speed - switch, k * speed] after the start frame. When cyclic, the first digit is
+        # appended once more so the last transition returns to it.
+        plan_digits = list(digits)
+        if should_add_cyclic:
+            plan_digits.append(plan_digits[0])
+        
+        transition_ends = scene.frame_start + np.arange(len(plan_digits), dtype=np.int32) * speed_frames
+        transition_starts = transition_ends - switch_frames
+        hold_end_keyframe = scene.frame_start + hold_frames
+        
+        # (digits, 7) on/off matrix, one column per segment, and the resulting
+        # (digits, 7, 3) local-space target of every segment for every digit
+        pattern_matrix = DIGIT_SEGMENT_STATES[plan_digits]
+        targets = np.where(pattern_matrix[:, :, None], on_matrix, off_matrix)
+        
+        # Segments that flip at each transition, as the XOR of consecutive digit masks
+        plan_bits = np.array(PATTERN_BITS)[plan_digits]
+        changed_bits = plan_bits[1:] ^ plan_bits[:-1]
+        
+        if _DEBUG:
+            print(f"Auto7Seg DEBUG: Planning {len(plan_digits)} digits ending at frame {transition_ends[-1]}" + (" (cyclic)" if should_add_cyclic else ""))
+        
+        for seg_idx, segment in enumerate(segments):
+            if segment is None:
+                continue
             
-            # Keyframe transition from last digit back to first digit
-            transition_start = current_frame
-            transition_end = current_frame + switch_frames
+            changes = np.flatnonzero(changed_bits & SEGMENT_MASKS[seg_idx]) + 1
+            key_frames, key_rows = _plan_keyframes(changes, transition_starts, transition_ends, hold_end_keyframe, should_add_cyclic)
             
-            print(f"Auto7Seg DEBUG: Transitioning from digit {last_digit} to {first_digit} at frames {transition_start}-{transition_end}")
+            # Put the segment in the first digit's state, which also sets the axes that are not
+            # animated, then write the keyframes with one bulk foreach_set per fcurve
+            key_values = targets[key_rows, seg_idx]
+            setattr(segment, data_path, key_values[0].tolist())
             
-            # Transition from last digit to first digit
-            for seg_idx, (segment, last_is_on, first_is_on) in enumerate(zip(segments, last_pattern, first_pattern)):
-                if segment is None:
-                    continue
+            co = np.empty(2 * len(key_frames), dtype=np.float32)
+            co[0::2] = key_frames
+            for array_index in animated_axes[segment]:
+                co[1::2] = key_values[:, array_index]
                 
-                print(f"Auto7Seg DEBUG: Processing cyclic transition segment {segment.name}, from {'ON' if last_is_on else 'OFF'} to {'ON' if first_is_on else 'OFF'}")
+                fcurve = fcurves[segment, array_index]
+                fcurve.keyframe_points.add(len(key_frames))
+                fcurve.keyframe_points.foreach_set('co', co)
                 
-                # Keyframe current state (last digit) at transition start
-                if mode in ('LOCAL_ROTATION', 'GLOBAL_ROTATION'):
-                    insert_keyframe(segment, 'rotation_euler', transition_start)
-                else:
-                    insert_keyframe(segment, data_path, transition_start)
+                # The fcurve was just created, so it has no modifiers yet
+                if should_add_cyclic:
+                    cycles_mod = fcurve.modifiers.new(type='CYCLES')
+                    cycles_mod.mode_before = 'NONE'
+                    cycles_mod.mode_after = 'REPEAT_OFFSET'
                 
-                # Set target state (first digit) and keyframe at transition end
-                if mode in ('LOCAL_ROTATION', 'GLOBAL_ROTATION'):
-                    target_tuple = on_values_tuple if first_is_on else off_values_tuple
-                    print(f"Auto7Seg DEBUG: Setting {segment.name} to rotation {target_tuple} for cyclic transition")
-                    apply_rotation(segment, target_tuple, mode)
-                    insert_keyframe(segment, 'rotation_euler', transition_end)
-                else:
-                    target_values = on_values if first_is_on else off_values
-                    print(f"Auto7Seg DEBUG: Setting {segment.name} to {mode} {target_values} for cyclic transition")
-                    if mode == 'GLOBAL_LOCATION':
-                        if segment.parent:
-                            parent_inv = segment.parent.matrix_world.inverted()
-                            local_pos = parent_inv @ target_values
-                        else:
-                            local_pos = target_values
-                        segment.location = local_pos
-                    else:
-                        apply_transform(segment, target_values, mode)
-                    
-                    insert_keyframe(segment, data_path, transition_end)
+                fcurve.update()
             
-            # Add one final keyframe that matches the first frame exactly for seamless looping
-            # This ensures the Cycles modifier can loop seamlessly
-            # Only add one keyframe at the end (transition_end already has the first digit state)
-            final_frame = transition_end
-            print(f"Auto7Seg DEBUG: Final keyframe already set at transition_end {final_frame} for seamless loop")
-        
-        # Verify first and last keyframes match for seamless looping (if cyclic)
-        if should_add_cyclic and len(digits) > 0:
+            if _DEBUG:
+                print(f"Auto7Seg DEBUG: {segment.name} {data_path} axes {animated_axes[segment]}: {len(key_frames)} keyframes each")
+        
+        # Verify first and last keyframes match for seamless looping (if cyclic). The keyframe
+        # plan guarantees this by construction, so the check is a debug-only diagnostic.
+        if _DEBUG and should_add_cyclic:
             print(f"Auto7Seg DEBUG: Verifying first and last keyframes match for seamless looping")
             
-            # Determine the data path based on mode
-            if mode in ('LOCAL_ROTATION', 'GLOBAL_ROTATION'):
-                verify_data_path = 'rotation_euler'
-            else:
-                verify_data_path = data_path
-            
-            for segment in segments:
-                if segment is None:
-                    continue
-                
-                channelbag = get_channelbag(segment)
-                if channelbag is None:
-                    continue
-                
-                try:
-                    for array_index in [0, 1, 2]:
-                        fcurve = channelbag.fcurves.find(verify_data_path, index=array_index)
-                        if fcurve is None:
-                            continue
-                        
-                        # Get first and last keyframe values
-                        if len(fcurve.keyframe_points) >= 2:
-                            first_kf = fcurve.keyframe_points[0]
-                            last_kf = fcurve.keyframe_points[-1]
-                            
-                            first_value = first_kf.co[1]
-                            last_value = last_kf.co[1]
-                            
-                            # Check if values match (with small tolerance for floating point)
-                            if abs(first_value - last_value) < 0.0001:
-                                print(f"Auto7Seg DEBUG: {segment.name} FCurve[{array_index}] first ({first_value}) and last ({last_value}) values match")
-                            else:
-                                print(f"Auto7Seg DEBUG: WARNING - {segment.name} FCurve[{array_index}] first ({first_value}) and last ({last_value}) values don't match!")
-                except Exception as e:
-                    print(f"Auto7Seg DEBUG: Error verifying keyframes for {segment.name}: {e}")
-        
-        # Add Cycles F-modifier to all fcurves for cyclic animation
-        if should_add_cyclic:
-            # Determine the data path based on mode
-            if mode in ('LOCAL_ROTATION', 'GLOBAL_ROTATION'):
-                cyclic_data_path = 'rotation_euler'
-            else:
-                cyclic_data_path = data_path
-            
-            # Add Cycles modifier to all fcurves for each segment
-            for segment in segments:
-                if segment is None:
-                    continue
-                
-                channelbag = get_channelbag(segment)
-                if channelbag is None:
-                    continue
-                
-                # Iterate through all array indices (0, 1, 2) for rotation_euler/location/scale
-                for array_index in [0, 1, 2]:
-                    fcurve = channelbag.fcurves.find(cyclic_data_path, index=array_index)
-                    
-                    if fcurve is None:
-                        continue
+            for (segment, array_index), fcurve in fcurves.items():
+                # Get first and last keyframe values
+                if len(fcurve.keyframe_points) >= 2:
+                    first_value = fcurve.keyframe_points[0].co[1]
+                    last_value = fcurve.keyframe_points[-1].co[1]
                     
-                    # Check if Cycles modifier already exists
-                    has_cycles = any(mod.type == 'CYCLES' for mod in fcurve.modifiers)
-                    
-                    if not has_cycles:
-                        try:
-                            cycles_mod = fcurve.modifiers.new(type='CYCLES')
-                            cycles_mod.mode_before = 'NONE'
-                            cycles_mod.mode_after = 'REPEAT_OFFSET'
-                            fcurve.update()
-                        except Exception:
-                            pass
+                    # Check if values match (with small tolerance for floating point)
+                    if abs(first_value - last_value) < 0.0001:
+                        print(f"Auto7Seg DEBUG: {segment.name} FCurve[{array_index}] first ({first_value}) and last ({last_value}) values match")
+                    else:
+                        print(f"Auto7Seg DEBUG: WARNING - {segment.name} FCurve[{array_index}] first ({first_value}) and last ({last_value}) values don't match!")
+        
+        # Keyframes were written straight to the fcurves, so a single depsgraph update
+        # is enough to refresh the segments once everything has been generated
+        context.view_layer.update()
         
         self.report({'INFO'}, f"Generated animation for {len(digits)} digits" + (" (cyclic)" if should_add_cyclic else ""))
         return {'FINISHED'}
@@ -915,23 +705,9 @@ class AUTO7SEG_PT_main_panel(Panel):
         box = layout.box()
         box.label(text="On/Off States", icon='KEYFRAME')
         
-        mode = props.transform_mode
-        
-        if mode == 'LOCAL_ROTATION':
-            self.draw_transform_row(box, props, "on_local_rotation", "On Rotation")
-            self.draw_transform_row(box, props, "off_local_rotation", "Off Rotation")
-        elif mode == 'GLOBAL_ROTATION':
-            self.draw_transform_row(box, props, "on_global_rotation", "On Rotation")
-            self.draw_transform_row(box, props, "off_global_rotation", "Off Rotation")
-        elif mode == 'LOCAL_LOCATION':
-            self.draw_transform_row(box, props, "on_local_location", "On Location")
-            self.draw_transform_row(box, props, "off_local_location", "Off Location")
-        elif mode == 'GLOBAL_LOCATION':
-            self.draw_transform_row(box, props, "on_global_location", "On Location")
-            self.draw_transform_row(box, props, "off_global_location", "Off Location")
-        else:  # SCALE
-            self.draw_transform_row(box, props, "on_scale", "On Scale")
-            self.draw_transform_row(box, props, "off_scale", "Off Scale")
+        on_prop, off_prop, _, label = _MODE_PROPS[props.transform_mode]
+        self.draw_transform_row(box, props, on_prop, f"On {label}")
+        self.draw_transform_row(box, props, off_prop, f"Off {label}")
         
         layout.separator()
         
@@ -967,19 +743,18 @@ class AUTO7SEG_PT_main_panel(Panel):
         layout.operator("auto7seg.generate_animation", text="Generate Animation", icon='RENDER_ANIMATION')
     
     def draw_transform_row(self, layout, props, prop_name, label):
-        """Draw a transform property with set-to-active buttons for each axis"""
+        """Draw a transform property with a set-to-active button that asks which axes to copy"""
         col = layout.column(align=True)
-        col.label(text=label)
+        
+        row = col.row(align=True)
+        row.label(text=label)
+        op = row.operator("auto7seg.set_to_active", text="", icon='EYEDROPPER')
+        op.property_name = prop_name
         
         axis_labels = ['X', 'Y', 'Z']
         
         for i, axis in enumerate(axis_labels):
-            row = col.row(align=True)
-            row.prop(props, prop_name, index=i, text=axis)
-            
-            op = row.operator("auto7seg.set_to_active", text="", icon='EYEDROPPER')
-            op.property_name = prop_name
-            op.axis = i
+            col.prop(props, prop_name, index=i, text=axis)
 
 
 # Registration